@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Claude Code Review Workflow Bulk Setup Script
+
+Runs setup-claude-review.py against many Totetech repositories in parallel.
+Each repository is shallow-cloned into its own directory and set up
+non-interactively by a separate worker process.
+
+Usage:
+    python setup-claude-review-bulk.py <repos-file> [--workers N] [--push]
+                                       [--delete-legacy] [--make-public]
+
+The repos file lists one repository name (without org prefix) per line;
+blank lines and lines starting with # are ignored.
+
+Example:
+    python setup-claude-review-bulk.py repos.txt --workers 8 --push
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# The setup script's file name is not a valid module name, so load it by path
+_spec = importlib.util.spec_from_file_location(
+    'setup_claude_review', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'setup-claude-review.py'))
+setup = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(setup)
+
+Colors = setup.Colors
+print_colored = setup.print_colored
+
+def read_repo_names(repos_file: str) -> list:
+    """Read repository names from a newline-separated file."""
+    with open(repos_file) as f:
+        names = [line.strip() for line in f]
+    return normalize_repo_names(name for name in names if name and not name.startswith('#'))
+
+def normalize_repo_names(repo_names) -> list:
+    """Drop duplicate names, keeping first-seen order, and reject unsafe ones.
+    
+    Each name becomes a checkout directory under the work dir, so a repeat would
+    send two workers into the same clone and 'totetech/foo' would nest a path.
+    """
+    repo_names = list(repo_names)
+    invalid = [name for name in repo_names if '/' in name or name.startswith('.')]
+    if invalid:
+        raise ValueError(f"Invalid repository names (use names without org prefix): {', '.join(invalid)}")
+    return list(dict.fromkeys(repo_names))
+
+def _init_worker(token: str | None) -> None:
+    """Seed each worker with the token read once by the parent process."""
+    if token:
+        setup._gh_token_cache = token
+
+def setup_one(repo_name: str, work_dir: str, make_public: bool, delete_legacy: bool,
+              push: bool) -> tuple:
+    """Clone one repository and run the setup in it; returns (repo_name, ok, output)."""
+    output = io.StringIO()
+    checkout = os.path.join(work_dir, repo_name)
+
+    with contextlib.redirect_stdout(output):
+        try:
+            if os.path.isdir(checkout):
+                # Reused --work-dir: bring the old clone up to date and drop
+                # anything a previous run left behind, pushed or not
+                commands = [
+                    ['git', '-C', checkout, 'fetch', '--depth', '1', 'origin'],
+                    ['git', '-C', checkout, 'reset', '--hard', 'origin/HEAD'],
+                    ['git', '-C', checkout, 'clean', '-fdq'],
+                ]
+            else:
+                commands = [['gh', 'repo', 'clone', f'totetech/{repo_name}', checkout,
+                             '--', '--depth', '1']]
+            for cmd in commands:
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                if result.returncode != 0:
+                    print_colored(f"❌ Failed to prepare checkout of totetech/{repo_name}", Colors.RED)
+                    print_colored(f"Error: {result.stderr.strip()}", Colors.RED)
+                    return repo_name, False, output.getvalue()
+
+            # Worker processes are reused across repositories, so switch every time
+            os.chdir(checkout)
+            ok = setup.main_for_repo(repo_name, make_public, delete_legacy, push)
+        except Exception as e:
+            print_colored(f"❌ Unexpected error: {e}", Colors.RED)
+            ok = False
+
+    return repo_name, ok, output.getvalue()
+
+def setup_many(repo_names: list, work_dir: str | None = None, workers: int | None = None,
+               make_public: bool = False, delete_legacy: bool = False, push: bool = False) -> list:
+    """Set up the workflow in every repository in parallel; returns the names that failed."""
+    repo_names = normalize_repo_names(repo_names)
+    work_dir = os.path.abspath(work_dir or tempfile.mkdtemp(prefix='claude-review-'))
+    os.makedirs(work_dir, exist_ok=True)
+    print_colored(f"📋 Setting up {len(repo_names)} repositories in {work_dir}", Colors.BLUE)
+
+    # Read the token once here instead of once per worker
+    token = setup._gh_token() if setup._has_gh_token() else None
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(token,)) as executor:
+        futures = [
+            executor.submit(setup_one, name, work_dir, make_public, delete_legacy, push)
+            for name in repo_names
+        ]
+        for future in as_completed(futures):
+            repo_name, ok, output = future.result()
+            sys.stdout.write(output)
+            if ok:
+                print_colored(f"✅ totetech/{repo_name} done", Colors.GREEN)
+            else:
+                print_colored(f"❌ totetech/{repo_name} failed", Colors.RED)
+                failed.append(repo_name)
+            print()
+    return failed
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description="Setup Claude Code Review workflow across many Totetech repositories"
+    )
+    parser.add_argument('repos_file', help='File with one repository name (without org prefix) per line')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Number of repositories to set up in parallel (default: CPU count)')
+    parser.add_argument('--work-dir',
+                        help='Directory for the repository clones (default: a new temporary directory)')
+    parser.add_argument('--make-public', action='store_true',
+                        help='Make the .github repository public if it is not')
+    parser.add_argument('--delete-legacy', action='store_true',
+                        help='Delete legacy claude.yml workflows')
+    parser.add_argument('--push', action='store_true',
+                        help='Push each commit (default: commit locally only)')
+    args = parser.parse_args()
+
+    try:
+        repo_names = read_repo_names(args.repos_file)
+    except ValueError as e:
+        print_colored(f"❌ {e}", Colors.RED)
+        sys.exit(1)
+    if not repo_names:
+        print_colored("❌ No repositories listed", Colors.RED)
+        sys.exit(1)
+
+    try:
+        failed = setup_many(repo_names, args.work_dir, args.workers, args.make_public,
+                            args.delete_legacy, args.push)
+    except KeyboardInterrupt:
+        print_colored("\n❌ Setup cancelled by user", Colors.RED)
+        sys.exit(1)
+
+    print_colored(f"🎉 {len(repo_names) - len(failed)}/{len(repo_names)} repositories set up", Colors.GREEN)
+    if failed:
+        print_colored(f"Failed: {', '.join(sorted(failed))}", Colors.RED)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
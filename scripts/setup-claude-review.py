@@ -5,19 +5,53 @@ Claude Code Review Workflow Setup Script
 Automatically implements Claude review workflow in any Totetech repository.
 
 Usage:
-    python setup-claude-review.py <repo-name>
+    python setup-claude-review.py <repo-name> [--yes] [--make-public | --no-make-public]
+                                  [--push | --no-push] [--delete-legacy | --keep-legacy]
     
 Example:
     python setup-claude-review.py my-repo
+    python setup-claude-review.py my-repo --yes --no-push
 """
 
+from __future__ import annotations
+
 import argparse
 import json
 import os
+import shutil
 import subprocess
 import sys
-from pathlib import Path
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Caller workflow written into the target repository
+_WORKFLOW_BYTES = b"""name: Claude Code Review
+# Automated AI-powered code reviews for pull requests
+
+on:
+  pull_request:
+    types: [opened, synchronize, ready_for_review, edited]
+
+permissions:
+  contents: read
+  id-token: write
+  pull-requests: write
+  issues: write
+
+jobs:
+  claude-review:
+    uses: totetech/.github/.github/workflows/claude-code-review.yml@main
+    with:
+      skip_large_prs: true
+      max_files: 50
+      max_lines: 2000
+      # custom_prompt: |
+      #   Add your custom review prompt here if needed
+      #   This will override the default prompt
+    secrets:
+      ANTHROPIC_API_KEY: ${{ secrets.ANTHROPIC_API_KEY }}
+"""
 
 # Colors for output
 class Colors:
@@ -27,40 +61,287 @@ class Colors:
     BLUE = '\033[0;34m'
     NC = '\033[0m'  # No Color
 
+_print_lock = threading.Lock()
+# Set per thread by _run_collecting_output so concurrent checks buffer their output
+_output_capture = threading.local()
+
 def print_colored(message: str, color: str = Colors.NC):
     """Print message with color."""
-    print(f"{color}{message}{Colors.NC}")
+    captured = getattr(_output_capture, 'lines', None)
+    if captured is not None:
+        captured.append((message, color))
+        return
+    with _print_lock:
+        print(f"{color}{message}{Colors.NC}")
+
+def print_colored_many(lines: list) -> None:
+    """Print (message, color) pairs with a single write; Colors.NC lines are left plain."""
+    captured = getattr(_output_capture, 'lines', None)
+    if captured is not None:
+        captured.extend(lines)
+        return
+    block = ''.join(
+        f"{message}\n" if color == Colors.NC else f"{color}{message}{Colors.NC}\n"
+        for message, color in lines
+    )
+    with _print_lock:
+        sys.stdout.write(block)
 
-def run_command(cmd: list, capture_output: bool = True, check: bool = True) -> subprocess.CompletedProcess:
-    """Run a command and return the result."""
+def run_command(cmd: list, capture_output: bool = True, check: bool = True, *,
+                discard: bool = False) -> subprocess.CompletedProcess:
+    """Run a command and return the result.
+    
+    With discard=True the output goes to /dev/null instead of pipes, for
+    probes where only the exit code matters.
+    """
     try:
+        if discard:
+            return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=check)
         return subprocess.run(cmd, capture_output=capture_output, text=True, check=check)
     except subprocess.CalledProcessError as e:
         print_colored(f"❌ Command failed: {' '.join(cmd)}", Colors.RED)
-        print_colored(f"Error: {e.stderr}", Colors.RED)
+        if e.stderr:
+            print_colored(f"Error: {e.stderr}", Colors.RED)
         raise
 
+def confirm(prompt: str, answer: bool | None = None) -> bool:
+    """Ask a y/N question, unless the answer was already given on the command line."""
+    if answer is not None:
+        return answer
+    try:
+        return input(prompt).lower() == 'y'
+    except EOFError:
+        # No terminal to answer from (e.g. CI with stdin closed): take the default
+        print()
+        return False
+
+def _run_collecting_output(func, *args) -> tuple:
+    """Call func with its print_colored output collected; returns (result, lines)."""
+    _output_capture.lines = []
+    try:
+        return func(*args), _output_capture.lines
+    finally:
+        _output_capture.lines = None
+
+class GitHubAPIError(Exception):
+    """Raised when the GitHub API cannot be reached or refuses a request."""
+
+GITHUB_API_HOST = 'api.github.com'
+
+# Last seen ETag and visibility of the .github repository, revalidated with If-None-Match
+VISIBILITY_CACHE_FILE = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'totetech-setup', 'etag')
+
+_gh_token_cache: str | None = None
+_gh_token_error: str | None = None
+_gh_token_lock = threading.Lock()
+# http.client connections are not thread-safe, so each thread keeps its own
+_gh_local = threading.local()
+_rate_limit_remaining: int | None = None
+_rate_limit_reset: int | None = None
+
+# Fetches target repository access and .github visibility in one round trip
+REPO_METADATA_QUERY = """
+query($repo: String!) {
+  target: repository(owner: "totetech", name: $repo) { viewerPermission }
+  dotgithub: repository(owner: "totetech", name: ".github") { visibility }
+}
+"""
+
+_cli_metadata_cache: dict = {}
+_cli_metadata_lock = threading.Lock()
+
+def _gh_token() -> str:
+    """Read the GitHub CLI token once and cache it."""
+    global _gh_token_cache, _gh_token_error
+    with _gh_token_lock:
+        if _gh_token_cache is None and _gh_token_error is None:
+            try:
+                result = subprocess.run(['gh', 'auth', 'token'], capture_output=True, text=True)
+                token = result.stdout.strip()
+                if result.returncode == 0 and token:
+                    _gh_token_cache = token
+                else:
+                    _gh_token_error = "GitHub CLI is not authenticated (run 'gh auth login')"
+            except FileNotFoundError:
+                _gh_token_error = "GitHub CLI not found"
+        if _gh_token_cache is None:
+            raise GitHubAPIError(_gh_token_error)
+        return _gh_token_cache
+
+def _has_gh_token() -> bool:
+    """Return True if a token is available for direct GitHub API requests."""
+    try:
+        _gh_token()
+        return True
+    except GitHubAPIError:
+        return False
+
+def _load_visibility_cache() -> dict:
+    """Load the cached .github ETag and visibility, if any."""
+    try:
+        with open(VISIBILITY_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_visibility_cache(etag: str, visibility: str) -> None:
+    """Persist the .github ETag and visibility; failures only cost a full fetch next time."""
+    try:
+        os.makedirs(os.path.dirname(VISIBILITY_CACHE_FILE), exist_ok=True)
+        tmp_file = f'{VISIBILITY_CACHE_FILE}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump({'etag': etag, 'visibility': visibility}, f)
+        os.replace(tmp_file, VISIBILITY_CACHE_FILE)
+    except OSError:
+        pass
+
+def _fetch_github_repo_visibility() -> str | None:
+    """Fetch the .github repository visibility, reusing the cached value on 304 Not Modified."""
+    cached = _load_visibility_cache()
+    extra_headers = None
+    if cached.get('etag') and cached.get('visibility'):
+        extra_headers = {'If-None-Match': cached['etag']}
+    
+    response, data = _github_api('GET', '/repos/totetech/.github', extra_headers=extra_headers)
+    if response.status == 304:
+        return cached['visibility']
+    if response.status != 200:
+        return None
+    
+    etag = response.getheader('ETag')
+    if etag:
+        _save_visibility_cache(etag, data['visibility'])
+    return data['visibility']
+
+def _fetch_repo_metadata_cli(repo_name: str) -> dict:
+    """Fetch repository access and .github visibility with a single gh GraphQL call.
+    
+    Used when no token can be read from the GitHub CLI (e.g. gh releases that
+    predate 'gh auth token'), so the checks still cost one subprocess instead of two.
+    """
+    with _cli_metadata_lock:
+        if repo_name not in _cli_metadata_cache:
+            # -f sends raw strings; -F would turn a repo named e.g. 2048 into an Int
+            try:
+                result = run_command(['gh', 'api', 'graphql',
+                                      '-f', f'query={REPO_METADATA_QUERY}',
+                                      '-f', f'repo={repo_name}'], check=False)
+            except FileNotFoundError:
+                raise GitHubAPIError("GitHub CLI not found")
+            
+            # A missing repository is reported as a GraphQL error with a partial
+            # payload, so parse stdout even when gh exits non-zero
+            try:
+                data = json.loads(result.stdout).get('data') or {}
+            except json.JSONDecodeError:
+                raise GitHubAPIError(result.stderr.strip() or "GraphQL query failed")
+            
+            target = data.get('target')
+            dotgithub = data.get('dotgithub')
+            _cli_metadata_cache[repo_name] = {
+                'access': bool(target and target.get('viewerPermission')),
+                'visibility': dotgithub['visibility'].lower() if dotgithub else None,
+            }
+        return _cli_metadata_cache[repo_name]
+
+def _gh_session():
+    """Return this thread's keep-alive connection to the GitHub API."""
+    import http.client  # deferred: pulls in ssl, which --help and usage errors never need
+    
+    connection = getattr(_gh_local, 'connection', None)
+    if connection is None:
+        connection = http.client.HTTPSConnection(GITHUB_API_HOST, timeout=30)
+        _gh_local.connection = connection
+    return connection
+
+def _github_api(method: str, path: str, body: dict | None = None,
+                extra_headers: dict | None = None):
+    """Send a GitHub REST API request and return the response with its decoded JSON body."""
+    import http.client
+    
+    global _rate_limit_remaining, _rate_limit_reset
+    # Short-circuit only until the window resets; bulk workers outlive it
+    if _rate_limit_remaining == 0 and _rate_limit_reset is not None and time.time() < _rate_limit_reset:
+        reset_at = time.strftime('%H:%M:%S', time.localtime(_rate_limit_reset))
+        raise GitHubAPIError(f"GitHub API rate limit exhausted (resets at {reset_at})")
+    
+    headers = {
+        'Authorization': f'Bearer {_gh_token()}',
+        'Accept': 'application/vnd.github+json',
+        'X-GitHub-Api-Version': '2022-11-28',
+        'User-Agent': 'totetech-setup-claude-review',
+    }
+    if extra_headers:
+        headers.update(extra_headers)
+    payload = None
+    if body is not None:
+        payload = json.dumps(body)
+        headers['Content-Type'] = 'application/json'
+    
+    connection = _gh_session()
+    # Retry once so a keep-alive connection dropped by the server is reopened
+    for attempt in range(2):
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            raw = response.read()
+            break
+        except (http.client.HTTPException, OSError) as e:
+            connection.close()
+            if attempt:
+                raise GitHubAPIError(f"{method} {path} failed: {e}") from e
+    
+    remaining = response.getheader('X-RateLimit-Remaining')
+    reset = response.getheader('X-RateLimit-Reset')
+    if remaining is not None and reset is not None:
+        _rate_limit_remaining = int(remaining)
+        _rate_limit_reset = int(reset)
+    
+    try:
+        data = json.loads(raw) if raw else None
+    except ValueError as e:
+        # e.g. an HTML error page from a proxy or a 502
+        raise GitHubAPIError(f"{method} {path} returned HTTP {response.status} with a non-JSON body") from e
+    return response, data
+
+def _find_git_dir(start: str = '.') -> str | None:
+    """Walk up from start looking for a .git entry, like 'git rev-parse --git-dir'."""
+    path = os.path.abspath(start)
+    while True:
+        # .git is a file rather than a directory in worktrees and submodules
+        candidate = os.path.join(path, '.git')
+        if os.path.exists(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
 def check_prerequisites() -> bool:
     """Check if all prerequisites are met."""
     print_colored("🔍 Checking prerequisites...", Colors.BLUE)
     
+    # Check if git is installed; the .git lookup below does not need it, but
+    # staging and committing later do
+    if shutil.which('git') is None:
+        print_colored("❌ git not found", Colors.RED)
+        print_colored("Please install git: https://git-scm.com/downloads", Colors.RED)
+        return False
+    
     # Check if in git repository
-    try:
-        run_command(['git', 'rev-parse', '--git-dir'])
-        print_colored("✅ Git repository detected", Colors.GREEN)
-    except subprocess.CalledProcessError:
+    if _find_git_dir() is None:
         print_colored("❌ Not in a git repository", Colors.RED)
         print_colored("Please run this script from the root of your repository", Colors.RED)
         return False
+    print_colored("✅ Git repository detected", Colors.GREEN)
     
     # Check if GitHub CLI is available
-    try:
-        run_command(['gh', '--version'])
-        print_colored("✅ GitHub CLI available", Colors.GREEN)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    if shutil.which('gh') is None:
         print_colored("❌ GitHub CLI not found", Colors.RED)
         print_colored("Please install GitHub CLI: https://cli.github.com/", Colors.RED)
         return False
+    print_colored("✅ GitHub CLI available", Colors.GREEN)
     
     return True
 
@@ -69,72 +350,141 @@ def verify_repository_access(repo_name: str) -> bool:
     print_colored(f"🔍 Verifying access to totetech/{repo_name}...", Colors.BLUE)
     
     try:
-        run_command(['gh', 'repo', 'view', f'totetech/{repo_name}'])
+        if _has_gh_token():
+            response, _ = _github_api('GET', f'/repos/totetech/{repo_name}')
+            has_access = response.status == 200
+        else:
+            has_access = _fetch_repo_metadata_cli(repo_name)['access']
+    except GitHubAPIError as e:
+        print_colored(f"❌ {e}", Colors.RED)
+        return False
+    
+    if has_access:
         print_colored("✅ Repository access verified", Colors.GREEN)
         return True
-    except subprocess.CalledProcessError:
-        print_colored(f"❌ Cannot access repository totetech/{repo_name}", Colors.RED)
-        print_colored("Please ensure:", Colors.RED)
-        print_colored("- Repository exists", Colors.RED)
-        print_colored("- You have access to the repository", Colors.RED)
-        print_colored("- GitHub CLI is authenticated (run 'gh auth login')", Colors.RED)
-        return False
+    
+    print_colored(f"❌ Cannot access repository totetech/{repo_name}", Colors.RED)
+    print_colored("Please ensure:", Colors.RED)
+    print_colored("- Repository exists", Colors.RED)
+    print_colored("- You have access to the repository", Colors.RED)
+    print_colored("- GitHub CLI is authenticated (run 'gh auth login')", Colors.RED)
+    return False
+
+def _make_github_repo_public() -> bool:
+    """Switch the .github repository to public visibility."""
+    if _has_gh_token():
+        response, _ = _github_api('PATCH', '/repos/totetech/.github', {'visibility': 'public'})
+        return response.status == 200
+    
+    result = run_command(['gh', 'repo', 'edit', 'totetech/.github',
+                          '--visibility', 'public', '--accept-visibility-change-consequences'],
+                         check=False)
+    return result.returncode == 0
 
-def ensure_github_repo_public() -> bool:
-    """Ensure the .github repository is public."""
+def check_github_repo_visibility(repo_name: str) -> str | None:
+    """Fetch the .github repository visibility; returns None if it cannot be determined."""
     print_colored("🔍 Checking .github repository visibility...", Colors.BLUE)
     
     try:
-        result = run_command(['gh', 'api', 'repos/totetech/.github', '--jq', '.visibility'])
-        visibility = result.stdout.strip()
-        
-        if visibility != 'public':
-            print_colored(f"⚠️  .github repository is {visibility}, needs to be public", Colors.YELLOW)
-            
-            response = input("Make .github repository public? (y/N): ")
-            if response.lower() == 'y':
-                print_colored("🔧 Making .github repository public...", Colors.BLUE)
-                run_command(['gh', 'repo', 'edit', 'totetech/.github', 
-                           '--visibility', 'public', '--accept-visibility-change-consequences'])
-                print_colored("✅ .github repository is now public", Colors.GREEN)
-                return True
-            else:
-                print_colored("❌ .github repository must be public for reusable workflows", Colors.RED)
-                return False
+        if _has_gh_token():
+            visibility = _fetch_github_repo_visibility()
         else:
-            print_colored("✅ .github repository is public", Colors.GREEN)
-            return True
-            
-    except subprocess.CalledProcessError:
+            visibility = _fetch_repo_metadata_cli(repo_name)['visibility']
+    except GitHubAPIError as e:
+        print_colored(f"❌ Failed to check .github repository visibility: {e}", Colors.RED)
+        return None
+    
+    if visibility is None:
         print_colored("❌ Failed to check .github repository visibility", Colors.RED)
+    elif visibility != 'public':
+        print_colored(f"⚠️  .github repository is {visibility}, needs to be public", Colors.YELLOW)
+    else:
+        print_colored("✅ .github repository is public", Colors.GREEN)
+    return visibility
+
+def ensure_github_repo_public(visibility: str | None, make_public: bool | None = None) -> bool:
+    """Ensure the .github repository is public, offering to change it if needed.
+    
+    Prompts, so it must run on the main thread and only after the other checks passed.
+    """
+    if visibility is None:
+        return False
+    if visibility == 'public':
+        return True
+    
+    if not confirm("Make .github repository public? (y/N): ", make_public):
+        print_colored("❌ .github repository must be public for reusable workflows", Colors.RED)
+        return False
+    
+    print_colored("🔧 Making .github repository public...", Colors.BLUE)
+    try:
+        made_public = _make_github_repo_public()
+    except GitHubAPIError as e:
+        print_colored(f"❌ {e}", Colors.RED)
+        made_public = False
+    if not made_public:
+        print_colored("❌ Failed to make .github repository public", Colors.RED)
         return False
+    print_colored("✅ .github repository is now public", Colors.GREEN)
+    return True
 
 def check_anthropic_secret(repo_name: str) -> None:
     """Check for ANTHROPIC_API_KEY secret."""
     print_colored("🔍 Checking for ANTHROPIC_API_KEY secret...", Colors.BLUE)
     
+    if not _has_gh_token():
+        # Secrets are not exposed through GraphQL, so the CLI fallback lists them
+        try:
+            result = run_command(['gh', 'secret', 'list', '--repo', f'totetech/{repo_name}'])
+            # Match the name column exactly so e.g. ANTHROPIC_API_KEY_OLD does not count
+            names = {line.split('\t', 1)[0] for line in result.stdout.splitlines()}
+            if 'ANTHROPIC_API_KEY' in names:
+                print_colored("✅ ANTHROPIC_API_KEY secret found at repository level", Colors.GREEN)
+            else:
+                print_colored("⚠️  ANTHROPIC_API_KEY not found at repository level", Colors.YELLOW)
+                print_colored("Assuming organization-level secret exists...", Colors.BLUE)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            print_colored("ℹ️  Could not check secrets, assuming organization-level secret exists", Colors.BLUE)
+        return
+    
+    # Ask for the secret by name: one request, no matter how many secrets exist
     try:
-        result = run_command(['gh', 'secret', 'list', '--repo', f'totetech/{repo_name}'])
-        if 'ANTHROPIC_API_KEY' in result.stdout:
-            print_colored("✅ ANTHROPIC_API_KEY secret found at repository level", Colors.GREEN)
-        else:
-            print_colored("⚠️  ANTHROPIC_API_KEY not found at repository level", Colors.YELLOW)
-            print_colored("Assuming organization-level secret exists...", Colors.BLUE)
-    except subprocess.CalledProcessError:
+        response, _ = _github_api('GET', f'/repos/totetech/{repo_name}/actions/secrets/ANTHROPIC_API_KEY')
+    except GitHubAPIError:
+        response = None
+    
+    if response is None or response.status not in (200, 404):
         print_colored("ℹ️  Could not check secrets, assuming organization-level secret exists", Colors.BLUE)
+        return
+    
+    if response.status == 200:
+        print_colored("✅ ANTHROPIC_API_KEY secret found at repository level", Colors.GREEN)
+    else:
+        print_colored("⚠️  ANTHROPIC_API_KEY not found at repository level", Colors.YELLOW)
+        print_colored("Assuming organization-level secret exists...", Colors.BLUE)
+
+def scan_workflows_dir() -> set:
+    """Return the entry names in .github/workflows with a single directory read."""
+    try:
+        with os.scandir('.github/workflows') as it:
+            return {entry.name for entry in it}
+    except FileNotFoundError:
+        return set()
 
-def handle_legacy_workflow() -> bool:
+def handle_legacy_workflow(delete_legacy: bool | None = None,
+                           workflow_entries: set | None = None) -> bool:
     """Handle existing claude.yml workflow."""
-    legacy_file = Path('.github/workflows/claude.yml')
+    legacy_file = '.github/workflows/claude.yml'
+    if workflow_entries is None:
+        workflow_entries = scan_workflows_dir()
     
-    if legacy_file.exists():
+    if 'claude.yml' in workflow_entries:
         print_colored("⚠️  Found legacy claude.yml workflow", Colors.YELLOW)
         print_colored("This should be replaced with the new claude-review.yml", Colors.YELLOW)
         
-        response = input("Delete legacy claude.yml workflow? (y/N): ")
-        if response.lower() == 'y':
+        if confirm("Delete legacy claude.yml workflow? (y/N): ", delete_legacy):
             print_colored("🗑️  Removing legacy workflow...", Colors.BLUE)
-            legacy_file.unlink()
+            os.remove(legacy_file)
             print_colored("✅ Legacy workflow removed", Colors.GREEN)
             return True
         else:
@@ -143,74 +493,114 @@ def handle_legacy_workflow() -> bool:
     
     return False
 
-def create_workflow_file() -> None:
-    """Create the Claude review workflow file."""
+def create_workflow_file(workflow_entries: set | None = None) -> bool:
+    """Create the Claude review workflow file.
+    
+    Returns False without touching the file when it already has the expected content.
+    """
+    if workflow_entries is None:
+        workflow_entries = scan_workflows_dir()
+    
     print_colored("📁 Creating .github/workflows directory...", Colors.BLUE)
-    workflows_dir = Path('.github/workflows')
-    workflows_dir.mkdir(parents=True, exist_ok=True)
+    workflows_dir = '.github/workflows'
+    os.makedirs(workflows_dir, exist_ok=True)
+    
+    workflow_file = os.path.join(workflows_dir, 'claude-review.yml')
     
-    workflow_file = workflows_dir / 'claude-review.yml'
+    existing = None
+    if 'claude-review.yml' in workflow_entries:
+        with open(workflow_file, 'rb') as f:
+            existing = f.read()
     
-    if workflow_file.exists():
+    if existing == _WORKFLOW_BYTES:
+        print_colored("✅ claude-review.yml is already up to date", Colors.GREEN)
+        return False
+    if existing is not None:
         print_colored("⚠️  claude-review.yml already exists - will overwrite", Colors.YELLOW)
     
     print_colored("📝 Creating Claude review workflow file...", Colors.BLUE)
     
-    workflow_content = """name: Claude Code Review
-# Automated AI-powered code reviews for pull requests
-
-on:
-  pull_request:
-    types: [opened, synchronize, ready_for_review, edited]
-
-permissions:
-  contents: read
-  id-token: write
-  pull-requests: write
-  issues: write
-
-jobs:
-  claude-review:
-    uses: totetech/.github/.github/workflows/claude-code-review.yml@main
-    with:
-      skip_large_prs: true
-      max_files: 50
-      max_lines: 2000
-      # custom_prompt: |
-      #   Add your custom review prompt here if needed
-      #   This will override the default prompt
-    secrets:
-      ANTHROPIC_API_KEY: ${{ secrets.ANTHROPIC_API_KEY }}
-"""
-    
-    workflow_file.write_text(workflow_content)
+    fd = os.open(workflow_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, _WORKFLOW_BYTES)
+    finally:
+        os.close(fd)
     print_colored("✅ Workflow file created", Colors.GREEN)
+    return True
 
-def validate_yaml(file_path: Path) -> None:
-    """Validate YAML syntax if yamllint is available."""
+def validate_yaml(file_path: str) -> bool:
+    """Validate YAML syntax in-process with PyYAML, or with yamllint if PyYAML is missing.
+    
+    Returns False only when the file was checked and does not parse; lint
+    findings are reported but do not block.
+    """
     print_colored("🔍 Validating YAML syntax...", Colors.BLUE)
     
     try:
-        run_command(['yamllint', str(file_path)])
+        import yaml
+    except ImportError:
+        yaml = None
+    
+    if yaml is not None:
+        # Prefer the libyaml-backed loader when PyYAML was built with it
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        try:
+            with open(file_path, 'rb') as f:
+                yaml.load(f, Loader=loader)
+        except yaml.YAMLError as e:
+            print_colored(f"❌ Invalid YAML in {file_path}: {e}", Colors.RED)
+            return False
         print_colored("✅ YAML syntax is valid", Colors.GREEN)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print_colored("ℹ️  yamllint not available, skipping validation", Colors.BLUE)
+        return True
+    
+    # The relaxed preset overrides the target repository's .yamllint, whose style
+    # rules (truthy, document-start, ...) must not reject our own fixed file
+    try:
+        result = run_command(['yamllint', '-d', 'relaxed', '-f', 'parsable', file_path], check=False)
+    except FileNotFoundError:
+        print_colored("ℹ️  PyYAML and yamllint not available, skipping validation", Colors.BLUE)
+        return True
+    
+    findings = result.stdout.strip()
+    if any(line.endswith('(syntax)') for line in findings.splitlines()):
+        print_colored(f"❌ Invalid YAML in {file_path}:", Colors.RED)
+        print_colored(findings, Colors.RED)
+        return False
+    if findings:
+        print_colored(f"⚠️  yamllint findings in {file_path} (not blocking):", Colors.YELLOW)
+        print_colored(findings, Colors.YELLOW)
+    print_colored("✅ YAML syntax is valid", Colors.GREEN)
+    return True
 
-def commit_and_push_changes(legacy_removed: bool) -> None:
+def commit_and_push_changes(legacy_removed: bool, workflow_changed: bool = True,
+                            push: bool | None = None) -> None:
     """Commit and optionally push the changes."""
     print_colored("📤 Preparing commit...", Colors.BLUE)
     
-    # Stage all workflow changes
-    run_command(['git', 'add', '.github/workflows/'])
+    # Only ever stage and commit the files this script manages, never the
+    # user's other edits under .github/workflows/
+    workflow_file = '.github/workflows/claude-review.yml'
     
-    # Check if there are changes to commit
-    try:
-        run_command(['git', 'diff', '--cached', '--quiet'])
-        print_colored("ℹ️  No changes to commit", Colors.BLUE)
-        return
-    except subprocess.CalledProcessError:
-        # There are changes to commit
-        pass
+    if not (workflow_changed or legacy_removed):
+        # Nothing was written this run; only a file left uncommitted by an
+        # earlier run still needs staging
+        result = run_command(['git', 'status', '--porcelain', '--', workflow_file])
+        if not result.stdout.strip():
+            print_colored("ℹ️  No changes to commit", Colors.BLUE)
+            return
+    
+    # Stage the workflow; 'git commit -o' alone would skip it while it is
+    # still untracked
+    run_command(['git', 'add', '--', workflow_file])
+    paths = [workflow_file]
+    
+    if legacy_removed:
+        # Stage the deletion; git prints "rm '<path>'" only if the file was tracked,
+        # and an untracked path would make 'git commit -o' fail
+        result = run_command(['git', 'rm', '--cached', '--ignore-unmatch', '--',
+                              '.github/workflows/claude.yml'])
+        if result.stdout.strip():
+            paths.append('.github/workflows/claude.yml')
     
     # Create commit message
     commit_message = """Add Claude code review workflow
@@ -223,13 +613,25 @@ def commit_and_push_changes(legacy_removed: bool) -> None:
     if legacy_removed:
         commit_message += "\n- Removes legacy claude.yml workflow"
     
-    run_command(['git', 'commit', '-m', commit_message])
+    # Commit only the managed files, leaving anything else the user had
+    # staged out of this commit
+    result = run_command(['git', 'commit', '-o', '-m', commit_message, '--', *paths], check=False)
+    if result.returncode != 0:
+        # Only the failure path pays for telling "nothing to commit" apart from
+        # a real error such as a rejecting hook
+        staged = run_command(['git', 'diff-index', '--cached', '--quiet', 'HEAD', '--', *paths],
+                             check=False, discard=True)
+        if staged.returncode == 0:
+            print_colored("ℹ️  No changes to commit", Colors.BLUE)
+            return
+        print_colored("❌ Command failed: git commit", Colors.RED)
+        print_colored(f"Error: {result.stderr or result.stdout}", Colors.RED)
+        raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
     print_colored("✅ Changes committed", Colors.GREEN)
     
     # Ask about pushing
     print()
-    response = input("🚀 Push to repository? (y/N): ")
-    if response.lower() == 'y':
+    if confirm("🚀 Push to repository? (y/N): ", push):
         print_colored("📤 Pushing to repository...", Colors.BLUE)
         run_command(['git', 'push'])
         print_colored("✅ Changes pushed", Colors.GREEN)
@@ -238,33 +640,99 @@ def commit_and_push_changes(legacy_removed: bool) -> None:
 
 def print_completion_message(legacy_removed: bool) -> None:
     """Print completion message with next steps."""
-    print()
-    print_colored("🎉 Claude Code Review Workflow Setup Complete!", Colors.GREEN)
-    print()
-    print_colored("📋 Next Steps:", Colors.BLUE)
-    print("1. 📤 Push changes if not already done: git push")
-    print("2. 🔍 Create a test PR to verify the workflow")
-    print("3. ✅ Check Actions tab for workflow execution")
-    print("4. 💬 Confirm Claude review appears on PR")
-    print()
-    print_colored("📚 Documentation:", Colors.BLUE)
-    print("- Workflow file: .github/workflows/claude-review.yml")
-    print("- Configuration: https://github.com/totetech/.github#claude-code-review-workflow")
-    print("- Troubleshooting: https://github.com/totetech/.github#troubleshooting")
-    print()
-    print_colored("⚙️  Current Configuration:", Colors.BLUE)
-    print("- Max files: 50")
-    print("- Max lines: 2000")
-    print("- Skip large PRs: true")
-    print("- Triggers: opened, synchronize, ready_for_review, edited")
-    print()
+    lines = [
+        ("", Colors.NC),
+        ("🎉 Claude Code Review Workflow Setup Complete!", Colors.GREEN),
+        ("", Colors.NC),
+        ("📋 Next Steps:", Colors.BLUE),
+        ("1. 📤 Push changes if not already done: git push", Colors.NC),
+        ("2. 🔍 Create a test PR to verify the workflow", Colors.NC),
+        ("3. ✅ Check Actions tab for workflow execution", Colors.NC),
+        ("4. 💬 Confirm Claude review appears on PR", Colors.NC),
+        ("", Colors.NC),
+        ("📚 Documentation:", Colors.BLUE),
+        ("- Workflow file: .github/workflows/claude-review.yml", Colors.NC),
+        ("- Configuration: https://github.com/totetech/.github#claude-code-review-workflow", Colors.NC),
+        ("- Troubleshooting: https://github.com/totetech/.github#troubleshooting", Colors.NC),
+        ("", Colors.NC),
+        ("⚙️  Current Configuration:", Colors.BLUE),
+        ("- Max files: 50", Colors.NC),
+        ("- Max lines: 2000", Colors.NC),
+        ("- Skip large PRs: true", Colors.NC),
+        ("- Triggers: opened, synchronize, ready_for_review, edited", Colors.NC),
+        ("", Colors.NC),
+    ]
     
     if legacy_removed:
-        print_colored("🗑️  Legacy Workflow:", Colors.BLUE)
-        print("- claude.yml removed (available in git history)")
-        print()
+        lines += [
+            ("🗑️  Legacy Workflow:", Colors.BLUE),
+            ("- claude.yml removed (available in git history)", Colors.NC),
+            ("", Colors.NC),
+        ]
+    
+    lines.append(("✨ Happy coding with AI-powered reviews!", Colors.GREEN))
+    print_colored_many(lines)
+
+def main_for_repo(repo_name: str, make_public: bool | None = None,
+                  delete_legacy: bool | None = None, push: bool | None = None) -> bool:
+    """Set up the workflow in the repository checked out in the current directory.
+    
+    Prompts are only shown for answers left as None. Returns False if a check failed.
+    """
+    print_colored_many([
+        ("🤖 Claude Code Review Workflow Setup", Colors.BLUE),
+        ("======================================", Colors.BLUE),
+        ("", Colors.NC),
+        (f"📋 Setting up Claude review workflow for: totetech/{repo_name}", Colors.BLUE),
+        ("", Colors.NC),
+    ])
+    
+    # Run the independent prerequisite and GitHub checks concurrently; none of
+    # them prompts or changes anything, so they are safe to run side by side
+    checks = [
+        ('prerequisites', check_prerequisites, ()),
+        ('access', verify_repository_access, (repo_name,)),
+        ('visibility', check_github_repo_visibility, (repo_name,)),
+        ('secret', check_anthropic_secret, (repo_name,)),
+    ]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {name: executor.submit(_run_collecting_output, func, *args)
+                   for name, func, args in checks}
+        results, outputs = {}, {}
+        for name, future in futures.items():
+            results[name], outputs[name] = future.result()
     
-    print_colored("✨ Happy coding with AI-powered reviews!", Colors.GREEN)
+    # Print each check's output as one block, in a fixed order. If the
+    # prerequisites failed, the other checks only repeat that problem (e.g.
+    # "GitHub CLI not found"), so show the prerequisites block alone
+    shown = [name for name, _, _ in checks] if results['prerequisites'] else ['prerequisites']
+    print_colored_many([line for name in shown for line in outputs[name]])
+    
+    if not (results['prerequisites'] and results['access']):
+        return False
+    
+    # Changing org visibility is only offered once the checks above passed
+    if not ensure_github_repo_public(results['visibility'], make_public):
+        return False
+    
+    # Handle legacy workflow
+    workflow_entries = scan_workflows_dir()
+    legacy_removed = handle_legacy_workflow(delete_legacy, workflow_entries)
+    
+    # Create new workflow file
+    workflow_changed = create_workflow_file(workflow_entries)
+    
+    # Validate YAML
+    if workflow_changed and not validate_yaml('.github/workflows/claude-review.yml'):
+        print_colored("❌ Not committing an invalid workflow file", Colors.RED)
+        return False
+    
+    # Commit and push changes
+    commit_and_push_changes(legacy_removed, workflow_changed, push)
+    
+    # Print completion message
+    print_completion_message(legacy_removed)
+    return True
 
 def main():
     """Main function."""
@@ -272,45 +740,34 @@ def main():
         description="Setup Claude Code Review workflow for Totetech repositories"
     )
     parser.add_argument('repo_name', help='Repository name (without org prefix)')
+    parser.add_argument('-y', '--yes', action='store_true',
+                        help='Answer yes to every prompt not decided by another flag')
+    make_public_group = parser.add_mutually_exclusive_group()
+    make_public_group.add_argument('--make-public', dest='make_public', action='store_true', default=None,
+                                   help='Make the .github repository public without asking, if needed')
+    make_public_group.add_argument('--no-make-public', dest='make_public', action='store_false',
+                                   help='Fail instead of asking when the .github repository is not public')
+    push_group = parser.add_mutually_exclusive_group()
+    push_group.add_argument('--push', dest='push', action='store_true', default=None,
+                            help='Push the commit without asking')
+    push_group.add_argument('--no-push', dest='push', action='store_false',
+                            help='Commit locally without asking to push')
+    legacy_group = parser.add_mutually_exclusive_group()
+    legacy_group.add_argument('--delete-legacy', dest='delete_legacy', action='store_true', default=None,
+                              help='Delete a legacy claude.yml workflow without asking')
+    legacy_group.add_argument('--keep-legacy', dest='delete_legacy', action='store_false',
+                              help='Keep a legacy claude.yml workflow without asking')
     args = parser.parse_args()
     
-    print_colored("🤖 Claude Code Review Workflow Setup", Colors.BLUE)
-    print_colored("======================================", Colors.BLUE)
-    print()
-    print_colored(f"📋 Setting up Claude review workflow for: totetech/{args.repo_name}", Colors.BLUE)
-    print()
+    # --yes only fills in answers that were not given explicitly
+    if args.yes:
+        for answer in ('make_public', 'push', 'delete_legacy'):
+            if getattr(args, answer) is None:
+                setattr(args, answer, True)
     
     try:
-        # Check prerequisites
-        if not check_prerequisites():
-            sys.exit(1)
-        
-        # Verify repository access
-        if not verify_repository_access(args.repo_name):
+        if not main_for_repo(args.repo_name, args.make_public, args.delete_legacy, args.push):
             sys.exit(1)
-        
-        # Ensure .github repo is public
-        if not ensure_github_repo_public():
-            sys.exit(1)
-        
-        # Check for API key secret
-        check_anthropic_secret(args.repo_name)
-        
-        # Handle legacy workflow
-        legacy_removed = handle_legacy_workflow()
-        
-        # Create new workflow file
-        create_workflow_file()
-        
-        # Validate YAML
-        validate_yaml(Path('.github/workflows/claude-review.yml'))
-        
-        # Commit and push changes
-        commit_and_push_changes(legacy_removed)
-        
-        # Print completion message
-        print_completion_message(legacy_removed)
-        
     except KeyboardInterrupt:
         print_colored("\n❌ Setup cancelled by user", Colors.RED)
         sys.exit(1)